@@ -1,7 +1,14 @@
 import streamlit as st
+import asyncio
 import json
+import queue
+import threading
+from typing import Optional, Tuple
 from src.main import AutonomousResearchOrchestrator
 from src.utils.config import Config
+from src.utils.cache import SemanticCache
+from src.utils.llm_factory import LLMFactory
+from src.tools.research_tools import clear_arxiv_cache
 
 # Page config
 st.set_page_config(
@@ -10,22 +17,85 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-if "orchestrator" not in st.session_state:
-    try:
-        st.session_state.orchestrator = AutonomousResearchOrchestrator()
-        st.session_state.ready = True
-    except ValueError as e:
-        st.session_state.ready = False
-        st.session_state.error = str(e)
+@st.cache_resource
+def get_orchestrator() -> AutonomousResearchOrchestrator:
+    """Build the orchestrator once and share it across sessions and reruns"""
+    return AutonomousResearchOrchestrator()
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop on a daemon thread, reused by every research run"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+@st.cache_resource
+def get_result_cache() -> SemanticCache:
+    """Near-duplicate query cache shared across sessions"""
+    return SemanticCache(LLMFactory.get_embeddings(), threshold=0.92, max_size=128, ttl=3600)
+
+def run_research(query: str, cache_key: str, on_stage=None, on_token=None) -> Tuple[dict, Optional[str]]:
+    """Run research, returning results and their raw JSON (None unless completed).
+
+    Both are reused for the same or a paraphrased query for an hour.
+    """
+    # Callbacks update the page while agents run, so this is cached outside st.cache_data.
+    # Agents get the query as typed; only the cache lookup uses the normalized key.
+    cached = get_result_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Callbacks fire on the loop thread, so queue them and update the page from this thread
+    events = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(get_orchestrator().aresearch(
+        query,
+        on_stage=lambda *args: events.put((on_stage, args)),
+        on_token=lambda *args: events.put((on_token, args))
+    ), get_event_loop())
+    
+    while not (future.done() and events.empty()):
+        try:
+            callback, args = events.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if callback is not None:
+            callback(*args)
+    
+    results = future.result()
+    if results.get("status") != "completed":
+        return results, None
+    
+    # Serialized once and cached with the results, so the raw view always matches them
+    raw_json = json.dumps(results, indent=2, default=str)
+    get_result_cache().put(cache_key, (results, raw_json))
+    return results, raw_json
+
+def render_agent_result(result: dict):
+    """Show one agent's output in its own expander"""
+    agent_name = result.get("agent", "unknown")
+    with st.expander(f"{agent_name.title()} Agent"):
+        if agent_name == "research":
+            st.write("**Findings:**")
+            st.write(result.get("findings", "No findings"))
+        elif agent_name == "analysis":
+            st.write("**Analysis:**")
+            st.write(result.get("analysis", "No analysis"))
+        elif agent_name == "summary":
+            st.write("**Summary:**")
+            st.write(result.get("summary", "No summary"))
+        elif agent_name == "memory":
+            st.write("**Context Analysis:**")
+            st.write(result.get("context_analysis", "No context"))
 
 # Main interface
 st.title("🔬 Autonomous Research Orchestrator")
 st.markdown("Multi-Agent AI Research System")
 
 # Check if system is ready
-if not st.session_state.get("ready", False):
-    st.error(f"System not ready: {st.session_state.get('error', 'Unknown error')}")
+try:
+    orchestrator = get_orchestrator()
+except ValueError as e:
+    st.error(f"System not ready: {e}")
     st.info("Please check your .env file and ensure all API keys are set.")
     st.stop()
 
@@ -34,55 +104,78 @@ st.sidebar.header("Configuration")
 st.sidebar.info(f"Groq Model: {Config.GROQ_MODEL}")
 st.sidebar.info(f"Gemini Model: {Config.GEMINI_MODEL}")
 
-# Main input
-query = st.text_input("Enter your research query:", placeholder="artificial intelligence trends in healthcare")
+# Main input (a form so editing the inputs doesn't rerun the script)
+with st.form("research_form"):
+    query = st.text_input("Enter your research query:", placeholder="artificial intelligence trends in healthcare")
+    force_refresh = st.checkbox("Force refresh", help="Clear cached results, LLM responses and ArXiv searches, then run the research again")
+    submitted = st.form_submit_button("Start Research", type="primary")
 
-if st.button("Start Research", type="primary"):
+if submitted:
     if query:
-        with st.spinner("Research in progress..."):
-            # Execute research
-            results = st.session_state.orchestrator.research(query)
-            
-            # Display results
-            if results.get("status") == "completed":
+        if force_refresh:
+            # The LLM and ArXiv caches would otherwise reproduce the same reports
+            get_result_cache().clear()
+            LLMFactory.clear_response_cache()
+            clear_arxiv_cache()
+        
+        # Layout is created up front so agent results can fill it in as they finish
+        header = st.container()
+        status = st.empty()
+        progress = st.progress(0)
+        status.text("Research in progress...")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Agent Results")
+        with col2:
+            st.subheader("Final Summary")
+            summary_box = st.empty()
+        
+        rendered = set()
+        tokens = []
+        
+        def on_stage(agent_name: str, percent: int, result: dict):
+            status.text(f"{agent_name.title()} agent completed")
+            progress.progress(percent)
+            with col1:
+                render_agent_result(result)
+            rendered.add(agent_name)
+        
+        def on_token(text: str):
+            tokens.append(text)
+            summary_box.markdown("".join(tokens))
+        
+        # Execute research (served from cache for repeated queries)
+        cache_key = query.strip().lower()
+        results, raw_json = run_research(query, cache_key, on_stage, on_token)
+        
+        status.empty()
+        progress.empty()
+        
+        # Display results
+        if results.get("status") == "completed":
+            with header:
                 st.success("Research completed successfully!")
                 
                 # Show workflow
                 st.subheader("Workflow Executed")
                 workflow = results.get("workflow", [])
                 st.write(" → ".join(workflow))
+            
+            # Cached results arrive without callbacks, so fill in anything not yet shown
+            with col1:
+                for result in results.get("results", []):
+                    if result.get("agent", "unknown") not in rendered:
+                        render_agent_result(result)
+            
+            summary_box.write(orchestrator.get_summary(results))
+            
+            # Raw results (expandable)
+            with st.expander("View Raw Results"):
+                st.code(raw_json, language="json")
                 
-                # Show agent results
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.subheader("Agent Results")
-                    for result in results.get("results", []):
-                        agent_name = result.get("agent", "unknown")
-                        with st.expander(f"{agent_name.title()} Agent"):
-                            if agent_name == "research":
-                                st.write("**Findings:**")
-                                st.write(result.get("findings", "No findings"))
-                            elif agent_name == "analysis":
-                                st.write("**Analysis:**")
-                                st.write(result.get("analysis", "No analysis"))
-                            elif agent_name == "summary":
-                                st.write("**Summary:**")
-                                st.write(result.get("summary", "No summary"))
-                            elif agent_name == "memory":
-                                st.write("**Context Analysis:**")
-                                st.write(result.get("context_analysis", "No context"))
-                
-                with col2:
-                    st.subheader("Final Summary")
-                    final_summary = st.session_state.orchestrator.get_summary(results)
-                    st.write(final_summary)
-                
-                # Raw results (expandable)
-                with st.expander("View Raw Results"):
-                    st.json(results)
-                    
-            else:
+        else:
+            with header:
                 st.error(f"Research failed: {results.get('error', 'Unknown error')}")
     else:
         st.warning("Please enter a research query.")
@@ -1,14 +1,29 @@
 import shutil
 import os
+import chromadb
+from chromadb.config import Settings
+from src.utils.config import Config
+from src.utils.llm_factory import LLMFactory
 
 # Clear ChromaDB data
-db_path = "./data/chroma_db"
+db_path = Config.CHROMA_DB_PATH
 if os.path.exists(db_path):
-    shutil.rmtree(db_path)
-    print(f"Cleared database at {db_path}")
+    try:
+        # Drop all collections through Chroma instead of deleting files one by one
+        client = chromadb.PersistentClient(path=db_path, settings=Settings(allow_reset=True))
+        client.reset()
+        print(f"Reset database at {db_path}")
+    except Exception as e:
+        print(f"Reset failed ({e}), removing files instead")
+        shutil.rmtree(db_path)
+        print(f"Cleared database at {db_path}")
 else:
     print("No existing database found")
 
 # Recreate directory
 os.makedirs(db_path, exist_ok=True)
-print("Database directory recreated")
\ No newline at end of file
+print("Database directory recreated")
+
+# Cached LLM responses would otherwise outlive the memory they were stored in
+LLMFactory.clear_response_cache()
+print("LLM response cache cleared")
@@ -1,40 +1,24 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from src.utils.llm_factory import LLMFactory
 from src.utils.memory_manager import MemoryManager
-import pandas as pd
-import json
+from src.utils.json_utils import dumps_pretty
 from typing import Dict, Any, List
 
-class AnalysisAgent:
-    def __init__(self):
-        self.llm = LLMFactory.get_gemini_llm()
-        self.memory = MemoryManager("analysis_memory")
-        
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an analysis specialist. Your task is to:
+ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an analysis specialist. Your task is to:
 1. Process and analyze research data
 2. Identify patterns and trends
 3. Generate insights and conclusions
 4. Create structured analysis reports
 
 Focus on data-driven insights and clear conclusions."""),
-            ("human", "{task}")
-        ])
-    
-    def execute(self, task: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute analysis task"""
-        # Get relevant context
-        context = self.memory.get_context(task)
-        
-        # Prepare analysis data
-        analysis_data = data or {}
-        
-        analysis_prompt = f"""
-Analysis Task: {task}
+    ("human", "{task}")
+])
+
+ANALYSIS_TASK_TEMPLATE = """Analysis Task: {task}
 
 Available Data:
-{json.dumps(analysis_data, indent=2)}
+{data}
 
 Relevant Context:
 {context}
@@ -44,39 +28,57 @@ Provide detailed analysis with:
 2. Data patterns
 3. Trends identified
 4. Conclusions
-5. Recommendations
-"""
+5. Recommendations"""
+
+class AnalysisAgent:
+    __slots__ = ("llm", "memory", "prompt")
+    
+    def __init__(self):
+        self.llm = LLMFactory.get_gemini_llm()
+        self.memory = MemoryManager.get("analysis_memory")
         
-        response = self.llm.invoke([HumanMessage(content=analysis_prompt)])
+        self.prompt = ANALYSIS_PROMPT
+    
+    def execute(self, task: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute analysis task"""
+        # Get relevant context
+        context = self.memory.get_context(task)
+        
+        # Prepare analysis data
+        analysis_data = data or {}
         
-        # Store analysis in memory
+        analysis_prompt = ANALYSIS_TASK_TEMPLATE.format(
+            task=task,
+            data=dumps_pretty(analysis_data),
+            context=context
+        )
+        
+        response = self.llm.invoke(self.prompt.format_messages(task=analysis_prompt))
+        analysis = response.content
+        
+        # Store analysis in memory (repeats only refresh the stored entry's metadata)
         metadata = {
             "agent": "analysis",
             "task": task,
             "data_sources": len(analysis_data) if analysis_data else 0
         }
         
-        self.memory.store_research(response.content, metadata)
+        self.memory.queue_research(analysis, metadata)
         
         return {
             "agent": "analysis",
             "task": task,
-            "analysis": response.content,
+            "analysis": analysis,
             "processed_data": analysis_data
         }
     
     def analyze_research_findings(self, research_results: List[Dict]) -> Dict[str, Any]:
         """Analyze research findings from multiple sources"""
         # Extract safe data without circular references
+        findings = [result.get("findings", "") for result in research_results]
         safe_data = {
             "total_sources": len(research_results),
-            "findings_preview": []
+            "findings_preview": [f[:300] + "..." if len(f) > 300 else f for f in findings if f]
         }
         
-        # Extract findings safely
-        for result in research_results:
-            findings = result.get("findings", "")
-            if findings:
-                safe_data["findings_preview"].append(findings[:300] + "..." if len(findings) > 300 else findings)
-        
         return self.execute("Analyze research findings", safe_data)
\ No newline at end of file
@@ -1,41 +1,22 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from src.utils.llm_factory import LLMFactory
 from src.tools.research_tools import search_arxiv, search_web
 from src.utils.memory_manager import MemoryManager
-from typing import Dict, Any
+from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
 
-class ResearchAgent:
-    def __init__(self):
-        self.llm = LLMFactory.get_groq_llm()
-        self.memory = MemoryManager("research_memory")
-        self.tools = [search_arxiv, search_web]
-        
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a research specialist. Your task is to:
+RESEARCH_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a research specialist. Your task is to:
 1. Search for relevant academic papers and current information
 2. Extract key insights and findings
 3. Store important findings in memory
 4. Return structured research results
 
 Use available tools to gather information. Focus on credible sources."""),
-            ("human", "{task}")
-        ])
-    
-    def execute(self, task: str) -> Dict[str, Any]:
-        """Execute research task"""
-        # Get existing context
-        context = self.memory.get_context(task)
-        
-        # Search ArXiv
-        arxiv_results = search_arxiv.invoke({"query": task, "max_results": 3})
-        
-        # Search web
-        web_results = search_web.invoke({"query": task})
-        
-        # Analyze findings
-        analysis_prompt = f"""
-Task: {task}
+    ("human", "{task}")
+])
+
+RESEARCH_TASK_TEMPLATE = """Task: {task}
 
 Existing Context:
 {context}
@@ -46,24 +27,87 @@ ArXiv Results:
 Web Results:
 {web_results}
 
-Provide a structured analysis of findings with key insights.
+Provide a structured analysis of findings with key insights."""
+
+PAPER_TEMPLATE = """{index}. {title}
+Authors: {authors}
+Published: {published}
+Categories: {categories}
+PDF: {pdf_url}
+Abstract: {summary}
 """
+
+def format_papers(papers: List[Dict]) -> str:
+    """Render ArXiv results as compact prompt text"""
+    if not papers:
+        return "No papers found."
+    
+    entries = []
+    for index, paper in enumerate(papers, 1):
+        authors = paper.get("authors", [])
+        entries.append(PAPER_TEMPLATE.format_map({
+            "index": index,
+            "title": paper.get("title", "N/A"),
+            "authors": ", ".join(authors[:3]) + (" et al." if len(authors) > 3 else ""),
+            "published": paper.get("published", "N/A")[:10],
+            "categories": ", ".join(paper.get("categories", [])),
+            "pdf_url": paper.get("pdf_url", "N/A"),
+            "summary": paper.get("summary", "N/A")
+        }))
+    return "\n".join(entries)
+
+class ResearchAgent:
+    __slots__ = ("llm", "memory", "tools", "prompt")
+    
+    def __init__(self):
+        self.llm = LLMFactory.get_groq_llm()
+        self.memory = MemoryManager.get("research_memory")
+        self.tools = [search_arxiv, search_web]
+        
+        self.prompt = RESEARCH_PROMPT
+    
+    def execute(self, task: str) -> Dict[str, Any]:
+        """Execute research task"""
+        # Context lookup, ArXiv and web search are independent network/IO calls,
+        # so run them side by side and wait for the slowest
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # Get existing context
+            context_future = executor.submit(self.memory.get_context, task)
+            
+            # Search ArXiv
+            arxiv_future = executor.submit(search_arxiv.invoke, {"query": task, "max_results": 3})
+            
+            # Search web
+            web_future = executor.submit(search_web.invoke, {"query": task})
+            
+            context = context_future.result()
+            arxiv_results = arxiv_future.result()
+            web_results = web_future.result()
+        
+        # Analyze findings
+        analysis_prompt = RESEARCH_TASK_TEMPLATE.format(
+            task=task,
+            context=context,
+            arxiv_results=format_papers(arxiv_results),
+            web_results=web_results
+        )
         
-        response = self.llm.invoke([HumanMessage(content=analysis_prompt)])
+        response = self.llm.invoke(self.prompt.format_messages(task=analysis_prompt))
+        findings = response.content
         
-        # Store findings in memory
+        # Store findings in memory (repeats only refresh the stored entry's metadata)
         metadata = {
             "agent": "research",
             "task": task,
             "sources": len(arxiv_results) + len(web_results.get("results", []))
         }
         
-        self.memory.store_research(response.content, metadata)
+        self.memory.queue_research(findings, metadata)
         
         return {
             "agent": "research",
             "task": task,
-            "findings": response.content,
+            "findings": findings,
             "sources": {
                 "arxiv": arxiv_results,
                 "web": web_results
@@ -1,36 +1,14 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from src.utils.llm_factory import LLMFactory
 from src.utils.memory_manager import MemoryManager
-from typing import Dict, Any, List
-import json
+from src.utils.json_utils import dumps_pretty, truncate_for_prompt
+from typing import Dict, Any, List, Callable, Optional
+from collections import Counter
 
-class SummaryAgent:
-    def __init__(self):
-        self.llm = LLMFactory.get_gemini_llm()
-        self.memory = MemoryManager("summary_memory")
-        
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a summary specialist. Your task is to:
-1. Create clear, concise summaries
-2. Structure information logically
-3. Highlight key points and insights
-4. Generate executive summaries
-
-Create professional reports suitable for stakeholders."""),
-            ("human", "{task}")
-        ])
-    
-    def execute(self, task: str, content: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute summary task"""
-        # Get relevant context
-        context = self.memory.get_context(task)
-        
-        summary_prompt = f"""
-Summary Task: {task}
+SUMMARY_TASK_TEMPLATE = """Summary Task: {task}
 
 Content to Summarize:
-{json.dumps(content, indent=2) if content else 'No content provided'}
+{content}
 
 Relevant Context:
 {context}
@@ -42,44 +20,99 @@ Create a comprehensive summary with:
 4. Action Items (if applicable)
 5. Conclusion
 
-Format as a professional report.
-"""
+Format as a professional report."""
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a summary specialist. Your task is to:
+1. Create clear, concise summaries
+2. Structure information logically
+3. Highlight key points and insights
+4. Generate executive summaries
+
+Create professional reports suitable for stakeholders."""),
+    ("human", SUMMARY_TASK_TEMPLATE)
+])
+
+class SummaryAgent:
+    __slots__ = ("llm", "memory", "prompt")
+    
+    def __init__(self):
+        self.llm = LLMFactory.get_gemini_llm()
+        self.memory = MemoryManager.get("summary_memory")
+        
+        self.prompt = SUMMARY_PROMPT
+    
+    def execute(self, task: str, content: Dict[str, Any] = None,
+                on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Execute summary task, streaming tokens to on_token when given"""
+        # Get relevant context
+        context = self.memory.get_context(task)
+        
+        # Serialized once and reused for the prompt and the length metadata
+        content_text = dumps_pretty(truncate_for_prompt(content)) if content else ""
+        
+        messages = self.prompt.format_messages(
+            task=task,
+            content=content_text or 'No content provided',
+            context=context
+        )
         
-        response = self.llm.invoke([HumanMessage(content=summary_prompt)])
+        if on_token is None:
+            response = self.llm.invoke(messages)
+            summary = response.content
+        else:
+            # Forward chunks as they arrive instead of waiting for the full report
+            chunks = []
+            for chunk in self.llm.stream(messages):
+                chunks.append(chunk.content)
+                on_token(chunk.content)
+            summary = "".join(chunks)
         
-        # Store summary in memory
+        # Store summary in memory (repeats only refresh the stored entry's metadata)
         metadata = {
             "agent": "summary",
             "task": task,
-            "content_length": len(str(content)) if content else 0
+            "content_length": len(content_text)
         }
         
-        self.memory.store_research(response.content, metadata)
+        self.memory.queue_research(summary, metadata)
         
         return {
             "agent": "summary",
             "task": task,
-            "summary": response.content,
+            "summary": summary,
             "source_content": content
         }
     
-    def create_final_report(self, all_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def create_final_report(self, all_results: List[Dict[str, Any]],
+                            on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """Create final comprehensive report"""
-        # Extract safe data without circular references
-        safe_content = {
-            "research_count": len([r for r in all_results if r.get("agent") == "research"]),
-            "analysis_count": len([r for r in all_results if r.get("agent") == "analysis"]),
-            "memory_count": len([r for r in all_results if r.get("agent") == "memory"]),
-            "total_agents": len(all_results),
-            "findings_summary": []
-        }
-        
-        # Extract key findings safely
+        # Count agents and extract key findings safely in one pass,
+        # skipping repeats of the same finding
+        counts = Counter()
+        findings_summary = []
+        seen = set()
         for result in all_results:
             agent_type = result.get("agent", "unknown")
+            counts[agent_type] += 1
             if agent_type == "research":
-                safe_content["findings_summary"].append(f"Research: {result.get('findings', 'No findings')[:200]}...")
+                finding = f"Research: {result.get('findings', 'No findings')[:200]}..."
             elif agent_type == "analysis":
-                safe_content["findings_summary"].append(f"Analysis: {result.get('analysis', 'No analysis')[:200]}...")
+                finding = f"Analysis: {result.get('analysis', 'No analysis')[:200]}..."
+            else:
+                continue
+            
+            if finding[:100] not in seen:
+                seen.add(finding[:100])
+                findings_summary.append(finding)
+        
+        # Extract safe data without circular references
+        safe_content = {
+            "research_count": counts["research"],
+            "analysis_count": counts["analysis"],
+            "memory_count": counts["memory"],
+            "total_agents": len(all_results),
+            "findings_summary": findings_summary
+        }
         
-        return self.execute("Create final comprehensive report", safe_content)
\ No newline at end of file
+        return self.execute("Create final comprehensive report", safe_content, on_token=on_token)
\ No newline at end of file
@@ -1,56 +1,103 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage
 from src.utils.llm_factory import LLMFactory
-from typing import Dict, Any, List
+from src.utils.config import Config
+from typing import Dict, Any, List, Callable, Optional
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# on_stage(agent_name, percent_complete, result) and on_token(text) progress hooks
+StageCallback = Callable[[str, int, Dict[str, Any]], None]
+TokenCallback = Callable[[str], None]
+
+SUPERVISOR_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are the supervisor coordinating a team of specialist agents:
+- Research Agent: Finds academic papers and current information
+- Analysis Agent: Processes data and identifies patterns
+- Summary Agent: Creates reports and summaries  
+- Memory Agent: Manages context and historical data
+
+Plan the workflow and coordinate agents to complete the user's request."""),
+    ("human", "{request}")
+])
+
+class _StageExecutor(Executor):
+    """Runs each workflow stage on its own daemon thread
+
+    Unlike asyncio's default executor, nothing joins these threads when asyncio.run
+    returns or the interpreter exits, so a stage that timed out is really left behind.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="workflow-stage", daemon=True).start()
+        return future
+
+_STAGE_POOL = _StageExecutor()
+
+def _keyword_pattern(*terms: str) -> re.Pattern:
+    """Case-insensitive substring match for any of terms in a single scan"""
+    return re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+
+DEFAULT_WORKFLOW = ("memory", "research", "analysis", "summary")
+
+# (request type pattern, workflow), checked in order
+WORKFLOW_ROUTES = (
+    # Technical/protocol queries
+    (_keyword_pattern("mcp", "protocol", "server", "api", "technical"), DEFAULT_WORKFLOW),
+    # Research-heavy queries
+    (_keyword_pattern("trends", "research", "study", "analysis", "survey"), DEFAULT_WORKFLOW),
+    # Quick factual queries
+    (_keyword_pattern("what is", "define", "explain", "how"), ("memory", "research", "summary")),
+    # Complex analysis queries
+    (_keyword_pattern("analyze", "compare", "evaluate", "assess"), DEFAULT_WORKFLOW),
+)
 
 class SupervisorAgent:
+    # Agents that only depend on the request and can run side by side
+    INDEPENDENT_AGENTS = ("memory", "research")
+    
+    # Caps agent stages (and so LLM calls) running at once across all workflows
+    AGENT_SLOTS = threading.BoundedSemaphore(Config.MAX_CONCURRENT_AGENTS)
+    
+    __slots__ = ("llm", "prompt", "_research_agent", "_analysis_agent", "_summary_agent", "_memory_agent")
+    
     def __init__(self):
-        print("DEBUG: Initializing supervisor agent...")
+        logger.debug("Initializing supervisor agent...")
         self.llm = LLMFactory.get_groq_llm()
-        print("DEBUG: LLM initialized")
+        logger.debug("LLM initialized")
         
         # Initialize specialist agents with lazy loading
         self._research_agent = None
         self._analysis_agent = None
         self._summary_agent = None
         self._memory_agent = None
-        print("DEBUG: Supervisor initialization complete")
+        logger.debug("Supervisor initialization complete")
         
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are the supervisor coordinating a team of specialist agents:
-- Research Agent: Finds academic papers and current information
-- Analysis Agent: Processes data and identifies patterns
-- Summary Agent: Creates reports and summaries  
-- Memory Agent: Manages context and historical data
-
-Plan the workflow and coordinate agents to complete the user's request."""),
-            ("human", "{request}")
-        ])
+        self.prompt = SUPERVISOR_PROMPT
     
     def plan_workflow(self, request: str) -> List[str]:
         """Plan agent execution workflow based on request type"""
-        # Analyze request type
-        request_lower = request.lower()
-        
-        # Technical/protocol queries
-        if any(term in request_lower for term in ["mcp", "protocol", "server", "api", "technical"]):
-            return ["memory", "research", "analysis", "summary"]
-        
-        # Research-heavy queries
-        elif any(term in request_lower for term in ["trends", "research", "study", "analysis", "survey"]):
-            return ["memory", "research", "analysis", "summary"]
-        
-        # Quick factual queries
-        elif any(term in request_lower for term in ["what is", "define", "explain", "how"]):
-            return ["memory", "research", "summary"]
-        
-        # Complex analysis queries
-        elif any(term in request_lower for term in ["analyze", "compare", "evaluate", "assess"]):
-            return ["memory", "research", "analysis", "summary"]
+        # First matching request type wins
+        for pattern, workflow in WORKFLOW_ROUTES:
+            if pattern.search(request):
+                return list(workflow)
         
         # Default comprehensive workflow
-        else:
-            return ["memory", "research", "analysis", "summary"]
+        return list(DEFAULT_WORKFLOW)
     
     @property
     def research_agent(self):
@@ -80,34 +127,109 @@ Plan the workflow and coordinate agents to complete the user's request."""),
             self._memory_agent = MemoryAgent()
         return self._memory_agent
     
-    def execute_workflow(self, request: str) -> Dict[str, Any]:
-        """Execute complete workflow"""
-        print(f"DEBUG: Planning workflow for: {request}")
-        workflow = self.plan_workflow(request)
-        print(f"DEBUG: Planned workflow: {workflow}")
-        
-        results = []
-        
-        # Execute agents in planned sequence
-        for agent_name in workflow:
-            print(f"DEBUG: Executing {agent_name} agent...")
-            
+    def _run_agent(self, agent_name: str, request: str, results: List[Dict[str, Any]],
+                   on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """Run a single workflow stage given the results gathered so far"""
+        with self.AGENT_SLOTS:
             if agent_name == "memory":
-                result = self.memory_agent.execute(request)
+                return self.memory_agent.execute(request)
             elif agent_name == "research":
-                result = self.research_agent.execute(request)
+                return self.research_agent.execute(request)
             elif agent_name == "analysis":
                 # Pass safe previous results to analysis
                 safe_results = [{"agent": r.get("agent"), "summary": str(r.get("findings", r.get("context_analysis", "")))[:200]} for r in results]
-                result = self.analysis_agent.execute(request, {"previous_results": safe_results})
+                return self.analysis_agent.execute(request, {"previous_results": safe_results})
             elif agent_name == "summary":
                 # Create final report
-                result = self.summary_agent.create_final_report(results)
+                return self.summary_agent.create_final_report(results, on_token=on_token)
+    
+    def _flush_memory(self, workflow: List[str]):
+        """Write the findings queued by each agent during the workflow"""
+        for agent_name in workflow:
+            getattr(self, f"{agent_name}_agent").memory.flush()
+    
+    @staticmethod
+    def _report_stage(on_stage: Optional[StageCallback], result: Dict[str, Any], done: int, total: int):
+        """Hand a finished stage's result to on_stage, with overall percent complete"""
+        if on_stage is not None:
+            on_stage(result.get("agent", "unknown"), int(100 * done / total), result)
+    
+    def execute_workflow(self, request: str, on_stage: Optional[StageCallback] = None,
+                         on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """Execute complete workflow from synchronous code
+
+        Safe to call while an event loop is running (Jupyter, async handlers); the workflow
+        then runs on its own loop in a worker thread and this call blocks until it finishes.
+        """
+        # Single implementation: the sync entry point drives the async workflow
+        workflow = self.aexecute_workflow(request, on_stage=on_stage, on_token=on_token)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(workflow)
+        
+        # asyncio.run refuses to nest inside a running loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, workflow).result()
+    
+    async def aexecute_workflow(self, request: str, on_stage: Optional[StageCallback] = None,
+                                on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """Execute complete workflow, running independent agents concurrently"""
+        logger.debug("Planning workflow for: %s", request)
+        workflow = self.plan_workflow(request)
+        logger.debug("Planned workflow: %s", workflow)
+        
+        # Build agents up front so concurrent stages don't race on lazy init
+        for agent_name in workflow:
+            getattr(self, f"{agent_name}_agent")
+        
+        done = 0
+        
+        # Callbacks always run on the event loop thread, never on the workers
+        loop = asyncio.get_running_loop()
+        worker_on_token = None
+        if on_token is not None:
+            def worker_on_token(text: str):
+                # A timed-out stage may keep streaming after the workflow's loop has closed
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(on_token, text)
+        
+        # Agents are blocking (LLM, ArXiv, Chroma), so each stage runs in a worker thread.
+        # On timeout the thread is abandoned, not stopped: it keeps its AGENT_SLOTS permit
+        # until the blocking call returns, so hung stages still count against the cap.
+        async def run_stage(agent_name: str, previous: List[Dict[str, Any]]) -> Dict[str, Any]:
+            nonlocal done
+            try:
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(_STAGE_POOL, self._run_agent, agent_name, request, previous, worker_on_token),
+                    timeout=Config.AGENT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"{agent_name} agent timed out after {Config.AGENT_TIMEOUT}s")
+            done += 1
+            self._report_stage(on_stage, result, done, len(workflow))
+            return result
+        
+        results = []
+        try:
+            independent = [name for name in workflow if name in self.INDEPENDENT_AGENTS]
+            logger.debug("Executing %s agents concurrently...", independent)
+            completed = dict(zip(independent, await asyncio.gather(
+                *(run_stage(name, []) for name in independent)
+            )))
             
-            print(f"DEBUG: {agent_name} agent completed")
-            results.append(result)
+            for agent_name in workflow:
+                if agent_name in completed:
+                    result = completed[agent_name]
+                else:
+                    logger.debug("Executing %s agent...", agent_name)
+                    result = await run_stage(agent_name, list(results))
+                    logger.debug("%s agent completed", agent_name)
+                results.append(result)
+        finally:
+            await asyncio.to_thread(self._flush_memory, workflow)
         
-        print("DEBUG: All agents completed")
+        logger.debug("All agents completed")
         return {
             "request": request,
             "workflow": workflow,
@@ -1,33 +1,55 @@
-from src.agents.supervisor import SupervisorAgent
+from src.agents.supervisor import SupervisorAgent, StageCallback, TokenCallback
 from src.utils.config import Config
-import json
-from typing import Dict, Any
+from src.utils.json_utils import dumps_pretty
+import asyncio
+import logging
+import os
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
 
 class AutonomousResearchOrchestrator:
+    __slots__ = ("supervisor",)
+    
     def __init__(self):
-        print("DEBUG: Starting orchestrator initialization...")
+        logger.debug("Starting orchestrator initialization...")
         
         # Validate API keys
-        print("DEBUG: Validating API keys...")
+        logger.debug("Validating API keys...")
         Config.validate_keys()
-        print("DEBUG: API keys validated")
+        logger.debug("API keys validated")
         
         # Initialize supervisor
-        print("DEBUG: Initializing supervisor...")
+        logger.debug("Initializing supervisor...")
         self.supervisor = SupervisorAgent()
-        print("DEBUG: Supervisor initialized successfully")
+        logger.debug("Supervisor initialized successfully")
     
-    def research(self, query: str) -> Dict[str, Any]:
+    def research(self, query: str, on_stage: Optional[StageCallback] = None,
+                 on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
         """Main research function"""
         try:
-            print(f"DEBUG: Starting research for: {query}")
-            results = self.supervisor.execute_workflow(query)
-            print("DEBUG: Research completed successfully")
+            logger.debug("Starting research for: %s", query)
+            results = self.supervisor.execute_workflow(query, on_stage=on_stage, on_token=on_token)
+            logger.debug("Research completed successfully")
+            return results
+        except Exception as e:
+            logger.exception("Research failed with error: %s", e)
+            return {
+                "error": str(e),
+                "status": "failed",
+                "query": query
+            }
+    
+    async def aresearch(self, query: str, on_stage: Optional[StageCallback] = None,
+                        on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """Main research function, running independent agents concurrently"""
+        try:
+            logger.debug("Starting research for: %s", query)
+            results = await self.supervisor.aexecute_workflow(query, on_stage=on_stage, on_token=on_token)
+            logger.debug("Research completed successfully")
             return results
         except Exception as e:
-            print(f"DEBUG: Research failed with error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Research failed with error: %s", e)
             return {
                 "error": str(e),
                 "status": "failed",
@@ -47,6 +69,10 @@ class AutonomousResearchOrchestrator:
         return "Summary not available"
 
 def main():
+    # Debug tracing is opt-in
+    if os.getenv("ORCH_DEBUG"):
+        logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
+    
     # Initialize orchestrator
     orchestrator = AutonomousResearchOrchestrator()
     
@@ -56,16 +82,29 @@ def main():
     print(f"Research Query: {query}")
     print("-" * 50)
     
+    # Stream the final report to the terminal as it is generated
+    streamed = []
+    
+    def on_token(text: str):
+        if not streamed:
+            print("\nFinal Summary:")
+            print("-" * 30)
+        streamed.append(text)
+        print(text, end="", flush=True)
+    
     # Execute research
-    results = orchestrator.research(query)
+    results = asyncio.run(orchestrator.aresearch(query, on_token=on_token))
+    if streamed:
+        print()
     
     # Print results
-    print(json.dumps(results, indent=2))
+    print(dumps_pretty(results))
     
-    # Print summary
-    print("\nFinal Summary:")
-    print("-" * 30)
-    print(orchestrator.get_summary(results))
+    # Print summary unless it was already streamed
+    if not streamed:
+        print("\nFinal Summary:")
+        print("-" * 30)
+        print(orchestrator.get_summary(results))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,13 +1,79 @@
 import arxiv
 import requests
 import feedparser
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 from langchain_core.tools import tool
+from src.utils.cache import DiskCache, SemanticCache, get_disk_cache
+from src.utils.config import Config
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
+# Feeds checked by search_web
+WEB_FEED_URLS = (
+    "https://feeds.feedburner.com/oreilly/radar",
+    "https://rss.cnn.com/rss/edition.rss",
+    "https://feeds.bbci.co.uk/news/technology/rss.xml"
+)
+FEED_TIMEOUT = 5
+
+# Shared keep-alive session so repeated hosts skip the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Serializes ArXiv requests across agents and sessions; the client's delay_seconds
+# spacing is only honoured when one thread uses it at a time
+_ARXIV_LOCK = threading.Lock()
+
+# Largest page the ArXiv API serves comfortably; bigger searches are paged by offset
+ARXIV_MAX_PAGE_SIZE = 100
+
+@lru_cache(maxsize=8)
+def _arxiv_client(page_size: int) -> arxiv.Client:
+    """Shared client per page size, keeping its HTTP session and rate-limit clock across calls"""
+    return arxiv.Client(page_size=page_size, delay_seconds=Config.ARXIV_DELAY_SECONDS)
+
+def _arxiv_cache() -> DiskCache:
+    return get_disk_cache("arxiv", Config.ARXIV_CACHE_TTL)
+
+@lru_cache(maxsize=8)
+def _arxiv_semantic_cache(max_results: int) -> SemanticCache:
+    """In-process cache matching paraphrased queries with the same result count"""
+    from src.utils.llm_factory import LLMFactory
+    return SemanticCache(LLMFactory.get_embeddings(), threshold=0.92, max_size=256, ttl=Config.ARXIV_CACHE_TTL)
+
+def clear_arxiv_cache():
+    """Forget stored ArXiv results, both on disk and in the semantic cache"""
+    _arxiv_cache().clear()
+    _arxiv_semantic_cache.cache_clear()
+
 @tool
 def search_arxiv(query: str, max_results: int = 5) -> List[Dict]:
     """Search ArXiv for research papers"""
-    client = arxiv.Client()
+    # Only whitespace is normalized for the cache key; case is kept because arXiv
+    # treats uppercase AND/OR/ANDNOT as operators and lowercase ones as terms
+    normalized = " ".join(query.split())
+    
+    # Serve repeated queries from the on-disk cache
+    cache_key = DiskCache.make_key(normalized, max_results)
+    cached = _arxiv_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Near-duplicate queries ("neural networks" / "neural network") reuse earlier results.
+    # Approximate hits stay in memory only; the disk cache holds results fetched for its key.
+    cached = _arxiv_semantic_cache(max_results).get(normalized)
+    if cached is not None:
+        return cached
+    
+    # The client requests page_size entries per call whatever max_results is, so size
+    # pages to the search and let it walk start offsets for anything larger
+    client = _arxiv_client(max(1, min(max_results, ARXIV_MAX_PAGE_SIZE)))
     search = arxiv.Search(
         query=query,
         max_results=max_results,
@@ -15,44 +81,56 @@ def search_arxiv(query: str, max_results: int = 5) -> List[Dict]:
     )
     
     results = []
-    for result in client.results(search):
-        results.append({
-            "title": result.title,
-            "authors": [str(author) for author in result.authors],
-            "summary": result.summary,
-            "pdf_url": result.pdf_url,
-            "published": str(result.published),
-            "categories": result.categories
-        })
+    with _ARXIV_LOCK:
+        for result in client.results(search):
+            results.append({
+                "title": result.title,
+                "authors": [str(author) for author in result.authors],
+                "summary": result.summary,
+                "pdf_url": result.pdf_url,
+                "published": str(result.published),
+                "categories": result.categories
+            })
+    
+    _arxiv_cache().put(cache_key, results)
+    _arxiv_semantic_cache(max_results).put(normalized, results)
     return results
 
+def _fetch_feed(url: str):
+    """Download and parse one feed, returning None if it is unavailable"""
+    try:
+        response = _SESSION.get(url, timeout=FEED_TIMEOUT)
+        response.raise_for_status()
+        return feedparser.parse(response.content)
+    except Exception as e:
+        logger.warning("Feed %s unavailable: %s", url, e)
+        return None
+
 @tool  
 def search_web(query: str) -> Dict:
     """Search web for current information"""
     try:
         results = []
         
-        # Multiple search strategies
-        search_urls = [
-            f"https://feeds.feedburner.com/oreilly/radar",
-            f"https://rss.cnn.com/rss/edition.rss",
-            f"https://feeds.bbci.co.uk/news/technology/rss.xml"
-        ]
+        # Fetch all feeds at once; total wait is the slowest feed, not the sum
+        with ThreadPoolExecutor(max_workers=len(WEB_FEED_URLS)) as executor:
+            feeds = list(executor.map(_fetch_feed, WEB_FEED_URLS))
         
-        for url in search_urls:
-            try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:3]:  # Limit per source
-                    if query.lower() in entry.title.lower() or query.lower() in entry.get('summary', '').lower():
-                        results.append({
-                            "title": entry.title,
-                            "summary": entry.get('summary', entry.get('description', 'No summary')),
-                            "link": entry.link,
-                            "published": entry.get('published', 'No date'),
-                            "source": url
-                        })
-            except:
+        needle = query.lower()
+        for url, feed in zip(WEB_FEED_URLS, feeds):
+            if feed is None:
                 continue
+            for entry in feed.entries[:3]:  # Limit per source
+                # Missing fields are skipped rather than raising mid-feed
+                title = entry.get('title', '')
+                if needle in title.lower() or needle in entry.get('summary', '').lower():
+                    results.append({
+                        "title": title,
+                        "summary": entry.get('summary', entry.get('description', 'No summary')),
+                        "link": entry.get('link', ''),
+                        "published": entry.get('published', 'No date'),
+                        "source": url
+                    })
         
         # If no RSS results, try simple HTTP search
         if not results:
@@ -73,16 +151,23 @@ def search_web(query: str) -> Dict:
         
         return {"results": results, "query": query, "total_found": len(results)}
     except Exception as e:
+        logger.exception("Web search failed for %s", query)
         return {"error": str(e), "query": query, "results": []}
 
 @tool
 def get_paper_content(pdf_url: str) -> str:
     """Get paper content from PDF URL"""
     try:
-        response = requests.get(pdf_url, timeout=30)
+        # Only availability is reported, so avoid downloading the PDF body
+        response = _SESSION.head(pdf_url, allow_redirects=True, timeout=10)
+        if response.status_code == 405:
+            # Server rejects HEAD; open the body as a stream and close it unread
+            with _SESSION.get(pdf_url, stream=True, timeout=30) as response:
+                pass
+        
         if response.status_code == 200:
             return f"PDF content retrieved from {pdf_url}"
         else:
             return f"Failed to retrieve PDF: {response.status_code}"
     except Exception as e:
-        return f"Error retrieving PDF: {str(e)}"
\ No newline at end of file
+        return f"Error retrieving PDF: {str(e)}"
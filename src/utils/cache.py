@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from .config import Config
+from .json_utils import dumps, loads
+
+class SemanticCache:
+    """LRU + TTL cache for text-keyed results with exact and near-duplicate lookup"""
+
+    def __init__(self, embeddings, threshold: float = 0.92, max_size: int = 256, ttl: float = 3600):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+
+        # key -> (normalized embedding, value, stored_at)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.ttl
+        for key in [k for k, (_, _, stored_at) in self._entries.items() if stored_at < cutoff]:
+            del self._entries[key]
+
+    def get(self, text: str) -> Optional[Any]:
+        """Return a cached value for text or a sufficiently similar text"""
+        key = self._key(text)
+
+        with self._lock:
+            self._evict_expired()
+
+            # Exact match short-circuits the embedding call
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][1]
+
+            if not self._entries:
+                return None
+
+            keys = list(self._entries)
+            matrix = np.stack([self._entries[k][0] for k in keys])
+
+        scores = matrix @ self._embed(text)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(keys[best])
+            if entry is None:
+                return None
+            self._entries.move_to_end(keys[best])
+            return entry[1]
+
+    def put(self, text: str, value: Any):
+        """Store value for text, evicting the least recently used entries"""
+        key = self._key(text)
+        vector = self._embed(text)
+
+        with self._lock:
+            self._entries[key] = (vector, value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that memoizes vectors by SHA-256 of the text"""
+
+    def __init__(self, embeddings: Embeddings, max_size: int = 4096):
+        self.embeddings = embeddings
+        self.max_size = max_size
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                return None
+            self._vectors.move_to_end(key)
+            return list(vector)
+
+    def _store(self, keys: List[str], vectors: List[List[float]]):
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._vectors[key] = tuple(vector)
+                self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_size:
+                self._vectors.popitem(last=False)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = [self._lookup(key) for key in keys]
+
+        # Only texts not seen before go to the model, in a single batch
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            self._store([keys[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector
+
+        vector = self.embeddings.embed_query(text)
+        self._store([key], [vector])
+        return vector
+
+class DiskCache:
+    """SQLite-backed TTL cache for JSON-serializable values"""
+
+    def __init__(self, path: str, ttl: float = 86400):
+        self.path = path
+        self.ttl = ttl
+
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # WAL lets readers proceed during writes; losing the last entries on a crash is fine for a cache
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a content-addressed key from the given parts"""
+        raw = "|".join(str(part) for part in parts)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, payload FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return loads(row[1])
+
+    def put(self, key: str, value: Any):
+        payload = dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, stored_at, payload) VALUES (?, ?, ?)",
+                (key, time.time(), payload)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+class CachedChatModel:
+    """Chat model proxy that serves repeated prompts from a DiskCache"""
+
+    def __init__(self, llm, cache: DiskCache, namespace: str):
+        self.llm = llm
+        self.cache = cache
+        self.namespace = namespace
+
+    def _key(self, messages) -> str:
+        # Role and content of every message, so system prompt changes invalidate entries
+        return DiskCache.make_key(self.namespace, json.dumps([[m.type, m.content] for m in messages]))
+
+    def invoke(self, messages, **kwargs):
+        key = self._key(messages)
+        content = self.cache.get(key)
+        if content is not None:
+            return AIMessage(content=content, response_metadata={"cached": True})
+
+        response = self.llm.invoke(messages, **kwargs)
+        self.cache.put(key, response.content)
+        return response
+
+    def stream(self, messages, **kwargs):
+        key = self._key(messages)
+        content = self.cache.get(key)
+        if content is not None:
+            yield AIMessageChunk(content=content, response_metadata={"cached": True})
+            return
+
+        chunks = []
+        for chunk in self.llm.stream(messages, **kwargs):
+            chunks.append(chunk.content)
+            yield chunk
+        # Only completed streams are cached
+        self.cache.put(key, "".join(chunks))
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+@lru_cache(maxsize=None)
+def get_disk_cache(name: str, ttl: float) -> DiskCache:
+    """Return the process-wide DiskCache stored as <CACHE_DIR>/<name>.sqlite"""
+    return DiskCache(os.path.join(Config.CACHE_DIR, f"{name}.sqlite"), ttl=ttl)
@@ -11,6 +11,21 @@ class Config:
     
     # Database
     CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "./data/chroma_db")
+    CACHE_DIR = os.getenv("CACHE_DIR", "./data/cache")
+    
+    # HNSW index settings for new memory collections (existing ones keep theirs)
+    HNSW_M = int(os.getenv("HNSW_M", "32"))
+    HNSW_CONSTRUCTION_EF = int(os.getenv("HNSW_CONSTRUCTION_EF", "200"))
+    HNSW_SEARCH_EF = int(os.getenv("HNSW_SEARCH_EF", "100"))
+    
+    # Embeddings ("torch", or "onnx" for the int8-quantized model; needs sentence-transformers[onnx])
+    EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "torch")
+    EMBEDDINGS_ONNX_FILE = os.getenv("EMBEDDINGS_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+    
+    # Search Settings
+    ARXIV_CACHE_TTL = 24 * 60 * 60
+    # arXiv's terms of use ask for 3 s between requests; lower only for local runs
+    ARXIV_DELAY_SECONDS = float(os.getenv("ARXIV_DELAY_SECONDS", "3.0"))
     
     # LLM Models
     GROQ_MODEL = "llama-3.3-70b-versatile"
@@ -19,6 +34,10 @@ class Config:
     # Agent Settings
     MAX_ITERATIONS = 5
     TEMPERATURE = 0.3
+    LLM_CACHE_TTL = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_TEMPERATURE = 0.3
+    AGENT_TIMEOUT = 180
+    MAX_CONCURRENT_AGENTS = 8
     
     @classmethod
     def validate_keys(cls):
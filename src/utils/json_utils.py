@@ -0,0 +1,53 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def truncate_for_prompt(obj: Any, max_chars_per_value: int = 500, max_total: int = 8000) -> Any:
+    """Copy of obj with long strings cut and remaining entries dropped past max_total characters"""
+    remaining = max_total
+
+    def walk(value: Any) -> Any:
+        nonlocal remaining
+        if isinstance(value, str):
+            text = value if len(value) <= max_chars_per_value else value[:max_chars_per_value] + "..."
+            remaining -= len(text)
+            return text
+        if isinstance(value, dict):
+            trimmed = {}
+            for key, item in value.items():
+                if remaining <= 0:
+                    break
+                trimmed[key] = walk(item)
+            return trimmed
+        if isinstance(value, (list, tuple)):
+            trimmed = []
+            for item in value:
+                if remaining <= 0:
+                    break
+                trimmed.append(walk(item))
+            return trimmed
+        remaining -= len(str(value))
+        return value
+
+    return walk(obj)
+
+def dumps(obj: Any) -> str:
+    """Compact JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+def loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def dumps_pretty(obj: Any) -> str:
+    """Indented JSON for prompts, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
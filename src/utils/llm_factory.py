@@ -1,28 +1,73 @@
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import HuggingFaceEmbeddings
 from .config import Config
+from functools import lru_cache
 
 class LLMFactory:
+    # Clients are memoized so every agent shares one instance (and its
+    # HTTP connection pool) per model configuration. Provider SDKs are
+    # imported on first use so entry points only pay for what they build.
+    @staticmethod
+    def _with_response_cache(llm, model: str, temperature: float):
+        """Serve repeated prompts from the persistent cache for low-temperature clients"""
+        # Sampling at higher temperatures is meant to vary, so those clients are left alone
+        if temperature > Config.LLM_CACHE_MAX_TEMPERATURE:
+            return llm
+        
+        from .cache import CachedChatModel, get_disk_cache
+        return CachedChatModel(llm, get_disk_cache("llm", Config.LLM_CACHE_TTL), f"{model}@{temperature}")
+    
+    @staticmethod
+    def clear_response_cache():
+        """Drop every cached LLM response so the next calls reach the provider"""
+        from .cache import get_disk_cache
+        get_disk_cache("llm", Config.LLM_CACHE_TTL).clear()
+    
+    @staticmethod
+    def _resolve_temperature(temperature) -> float:
+        # Explicit 0.0 is honoured, and None and the default share one cache entry
+        return Config.TEMPERATURE if temperature is None else float(temperature)
+    
     @staticmethod
     def get_groq_llm(temperature=None):
-        return ChatGroq(
+        return LLMFactory._groq_llm(LLMFactory._resolve_temperature(temperature))
+    
+    @staticmethod
+    def get_gemini_llm(temperature=None):
+        return LLMFactory._gemini_llm(LLMFactory._resolve_temperature(temperature))
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _groq_llm(temperature: float):
+        from langchain_groq import ChatGroq
+        return LLMFactory._with_response_cache(ChatGroq(
             model=Config.GROQ_MODEL,
-            temperature=temperature or Config.TEMPERATURE,
+            temperature=temperature,
             groq_api_key=Config.GROQ_API_KEY
-        )
+        ), Config.GROQ_MODEL, temperature)
     
     @staticmethod
-    def get_gemini_llm(temperature=None):
-        return ChatGoogleGenerativeAI(
+    @lru_cache(maxsize=8)
+    def _gemini_llm(temperature: float):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return LLMFactory._with_response_cache(ChatGoogleGenerativeAI(
             model=Config.GEMINI_MODEL,
-            temperature=temperature or Config.TEMPERATURE,
+            temperature=temperature,
             google_api_key=Config.GOOGLE_API_KEY
-        )
+        ), Config.GEMINI_MODEL, temperature)
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_embeddings():
-        # Use larger HuggingFace model to match expected 768 dimensions
-        return HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-mpnet-base-v2"
-        )
\ No newline at end of file
+        from langchain_huggingface import HuggingFaceEmbeddings
+        from .cache import CachedEmbeddings
+        
+        # Optionally run the int8-quantized ONNX export of the same model on CPU
+        model_kwargs = {}
+        if Config.EMBEDDINGS_BACKEND == "onnx":
+            model_kwargs = {"backend": "onnx", "model_kwargs": {"file_name": Config.EMBEDDINGS_ONNX_FILE}}
+        
+        # Use larger HuggingFace model to match expected 768 dimensions.
+        # Agents look up context for the same request, so query vectors are memoized.
+        return CachedEmbeddings(HuggingFaceEmbeddings(
+            model_name="sentence-transformers/all-mpnet-base-v2",
+            model_kwargs=model_kwargs
+        ))
\ No newline at end of file
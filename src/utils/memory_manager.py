@@ -1,46 +1,180 @@
-from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from .llm_factory import LLMFactory
 from .config import Config
+from functools import lru_cache
+import atexit
+import hashlib
+import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
+# Documents per add call; Chroma inserts fastest in batches of a few hundred
+CHROMA_ADD_BATCH_SIZE = 200
+
+# HNSW index settings, applied when a collection is first created; Chroma keeps
+# a collection's creation-time settings, so changes need clear_db.py to take effect
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": Config.HNSW_CONSTRUCTION_EF,
+    "hnsw:M": Config.HNSW_M,
+    "hnsw:search_ef": Config.HNSW_SEARCH_EF
+}
+
+@lru_cache(maxsize=None)
+def get_chroma_client(path: str):
+    """Return the process-wide Chroma client for a persist directory"""
+    # chromadb is heavy to import, so it is loaded on first use
+    import chromadb
+    
+    # Ensure directory exists
+    os.makedirs(path, exist_ok=True)
+    return chromadb.PersistentClient(path=path)
+
 class MemoryManager:
+    # Similarity results are reused until the collection changes or they expire
+    QUERY_CACHE_SIZE = 256
+    QUERY_CACHE_TTL = 600
+    
+    _instances: Dict[str, "MemoryManager"] = {}
+    _instances_lock = threading.Lock()
+    
+    @classmethod
+    def get(cls, collection_name: str = "research_memory") -> "MemoryManager":
+        """Return the shared manager for a collection, opening it on first use"""
+        with cls._instances_lock:
+            if collection_name not in cls._instances:
+                manager = cls(collection_name)
+                # Agents used outside the supervisor never flush, so write leftovers at exit
+                atexit.register(manager.flush)
+                cls._instances[collection_name] = manager
+            return cls._instances[collection_name]
+    
     def __init__(self, collection_name: str = "research_memory"):
+        from langchain_chroma import Chroma
+        
         self.embeddings = LLMFactory.get_embeddings()
         self.collection_name = collection_name
         
-        # Ensure directory exists
-        os.makedirs(Config.CHROMA_DB_PATH, exist_ok=True)
-        
+        # All collections share one client instead of each opening the database
+        client = get_chroma_client(Config.CHROMA_DB_PATH)
         self.vectorstore = Chroma(
             collection_name=collection_name,
             embedding_function=self.embeddings,
-            persist_directory=Config.CHROMA_DB_PATH
+            client=client,
+            collection_metadata=HNSW_METADATA
         )
+        # Raw collection for metadata-only updates, which skip the embedding function
+        self._collection = client.get_collection(collection_name)
+        
+        # Findings queued during a workflow and written together by flush()
+        self._pending: List[Document] = []
+        self._lock = threading.Lock()
+        
+        # (k, query hash) -> (documents, stored_at)
+        self._query_cache = OrderedDict()
+        self._generation = 0
     
     def store_research(self, content: str, metadata: Dict) -> str:
         """Store research findings in vector database"""
-        doc = Document(page_content=content, metadata=metadata)
-        doc_id = self.vectorstore.add_documents([doc])[0]
-        return doc_id
+        return self.store_research_batch([content], [metadata])[0]
     
-    def retrieve_similar(self, query: str, k: int = 3) -> List[Document]:
-        """Retrieve similar documents from memory"""
-        return self.vectorstore.similarity_search(query, k=k)
+    def store_research_batch(self, contents: List[str], metadatas: List[Dict]) -> List[str]:
+        """Store several findings with one embedding pass and one insert"""
+        docs = [Document(page_content=content, metadata=metadata) for content, metadata in zip(contents, metadatas)]
+        return self._add_documents(docs)
     
-    def get_context(self, query: str, max_docs: int = 5) -> str:
+    def queue_research(self, content: str, metadata: Dict):
+        """Queue research findings to be stored on the next flush()"""
+        with self._lock:
+            self._pending.append(Document(page_content=content, metadata=metadata))
+    
+    def flush(self) -> List[str]:
+        """Store all queued findings in a single batch"""
+        with self._lock:
+            docs, self._pending = self._pending, []
+        
+        # Runs from the supervisor's finally block and at exit, where raising would hide
+        # the workflow's own outcome, so failures are logged instead
+        try:
+            return self._add_documents(docs)
+        except Exception:
+            logger.exception("Failed to store %d queued documents in %s", len(docs), self.collection_name)
+            return []
+    
+    @staticmethod
+    def _document_id(content: str) -> str:
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _add_documents(self, docs: List[Document]) -> List[str]:
+        """Insert docs under content-hash ids; already stored content only gets its metadata refreshed"""
+        ids = [self._document_id(doc.page_content) for doc in docs]
+        if not ids:
+            return []
+        
+        # The last copy of repeated content in a batch wins, as with an upsert
+        latest = dict(zip(ids, docs))
+        existing = set(self.vectorstore.get(ids=list(latest), include=[])["ids"])
+        new_ids = [doc_id for doc_id in latest if doc_id not in existing]
+        refreshed = [doc_id for doc_id in latest if doc_id in existing and latest[doc_id].metadata]
+        
+        try:
+            # Repeated findings keep their vector, so they are not re-embedded
+            if refreshed:
+                self._collection.update(ids=refreshed, metadatas=[latest[doc_id].metadata for doc_id in refreshed])
+            for start in range(0, len(new_ids), CHROMA_ADD_BATCH_SIZE):
+                chunk = new_ids[start:start + CHROMA_ADD_BATCH_SIZE]
+                self.vectorstore.add_documents([latest[doc_id] for doc_id in chunk], ids=chunk)
+        finally:
+            # Chunks stored before a failure are already searchable
+            if new_ids or refreshed:
+                self._invalidate_queries()
+        return ids
+    
+    def _invalidate_queries(self):
+        with self._lock:
+            self._query_cache.clear()
+            self._generation += 1
+    
+    def retrieve_similar(self, query: str, k: int = 3, mmr: bool = False, mmr_lambda: float = 0.5) -> List[Document]:
+        """Retrieve similar documents from memory, optionally MMR re-ranked for diversity"""
+        key = (k, mmr_lambda if mmr else None, hashlib.sha256(query.encode("utf-8")).hexdigest())
+        with self._lock:
+            entry = self._query_cache.get(key)
+            if entry is not None and time.time() - entry[1] <= self.QUERY_CACHE_TTL:
+                self._query_cache.move_to_end(key)
+                return list(entry[0])
+            generation = self._generation
+        
+        if mmr:
+            # Re-ranks 3k nearest neighbours with vectorized similarity matrices
+            docs = self.vectorstore.max_marginal_relevance_search(query, k=k, fetch_k=3 * k, lambda_mult=mmr_lambda)
+        else:
+            docs = self.vectorstore.similarity_search(query, k=k)
+        
+        with self._lock:
+            # A write during the search makes these results stale
+            if generation != self._generation:
+                return list(docs)
+            self._query_cache[key] = (docs, time.time())
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return list(docs)
+    
+    def get_context(self, query: str, max_docs: int = 5, mmr: bool = False) -> str:
         """Get formatted context for query"""
-        docs = self.retrieve_similar(query, k=max_docs)
+        docs = self.retrieve_similar(query, k=max_docs, mmr=mmr)
         if not docs:
             return "No relevant context found."
         
-        context_parts = []
-        for i, doc in enumerate(docs, 1):
-            context_parts.append(f"Context {i}: {doc.page_content}")
-        
-        return "\n\n".join(context_parts)
+        return "\n\n".join(f"Context {i}: {doc.page_content}" for i, doc in enumerate(docs, 1))
     
     def clear_memory(self):
         """Clear all stored memory"""
-        self.vectorstore.delete_collection()
\ No newline at end of file
+        self.vectorstore.delete_collection()
+        self._invalidate_queries()
\ No newline at end of file